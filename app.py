@@ -258,8 +258,7 @@ def show_patient_dashboard():
         
         # AI Mode Toggle
         st.markdown("#### 🤖 AI Mode")
-        agent = RMDScreeningAgent()
-        if agent.is_configured():
+        if RMDScreeningAgent.has_env_key():
             demo_mode = st.toggle("Demo Mode", value=st.session_state.get('demo_mode', False),
                                   help="Toggle between Live AI (Groq LLM) and Demo Mode (rule-based)")
             st.session_state.demo_mode = demo_mode
@@ -614,7 +613,7 @@ def show_patient_assessment_form(user):
                 red_flags=assessment.red_flags_identified,
                 recommended_action=assessment.recommended_next_step,
                 reasoning=assessment.reasoning,
-                xai_explanation=xai.__dict__,
+                xai_explanation=xai.to_dict(),
                 fhir_bundle=fhir_bundle
             )
         
@@ -18,7 +18,7 @@ For detailed FHIR mappings, see docs/FHIR_MAPPING.md
 
 from datetime import datetime
 from typing import Literal, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 import uuid
 
 
@@ -38,6 +38,9 @@ class Symptom(BaseModel):
     - Joint swelling: 298158008
     """
     
+    # Observations are recorded once and never edited, so freeze them
+    model_config = ConfigDict(frozen=True)
+    
     name: str = Field(
         ...,
         description="Name of the symptom (e.g., 'joint_pain', 'morning_stiffness')"
@@ -227,17 +230,12 @@ STANDARD_SYMPTOMS = [
 ]
 
 
+# Validates a whole list of symptom dicts in one pydantic-core call
+SYMPTOM_LIST_ADAPTER = TypeAdapter(list[Symptom])
+
+
 def create_default_symptoms() -> list[Symptom]:
     """Create a list of standard symptoms with default (not present) values."""
-    return [
-        Symptom(name="joint_pain", present=False, severity=None, duration_days=None),
-        Symptom(name="multiple_joints_affected", present=False),
-        Symptom(name="morning_stiffness", present=False, severity=None, duration_days=None),
-        Symptom(name="joint_swelling", present=False),
-        Symptom(name="joint_redness", present=False),
-        Symptom(name="fatigue", present=False, severity=None),
-        Symptom(name="reduced_mobility", present=False),
-        Symptom(name="fever", present=False),
-        Symptom(name="weight_loss", present=False),
-        Symptom(name="skin_rash", present=False)
-    ]
+    return SYMPTOM_LIST_ADAPTER.validate_python(
+        [{"name": name, "present": False} for name in STANDARD_SYMPTOMS]
+    )
@@ -21,8 +21,9 @@ References:
 """
 
 from datetime import datetime
-from typing import Literal, Optional, Any
+from typing import Callable, Iterator, Literal, Optional, Any
 from pydantic import BaseModel, Field
+from pydantic_core import to_json
 import uuid
 
 
@@ -448,41 +449,38 @@ class FHIRBundle(BaseModel):
         resource_type = resource_dict.get("resourceType", "Unknown")
         resource_id = resource_dict.get("id", str(uuid.uuid4()))
         
-        self.entry.append(FHIRBundleEntry(
+        # The entry wraps a dict the resource model just produced, so skip
+        # re-validating it
+        self.entry.append(FHIRBundleEntry.model_construct(
             fullUrl=f"urn:uuid:{resource_id}",
             resource=resource_dict
         ))
     
+    def iter_resources(self) -> Iterator[tuple[str, str]]:
+        """Yield (resourceType, id) for each entry without serializing the bundle."""
+        for entry in self.entry:
+            resource = entry.resource
+            yield resource.get("resourceType", "Unknown"), resource.get("id", "N/A")
+    
     def to_fhir_json(self) -> dict:
         """Convert to FHIR-compliant JSON."""
         return self.model_dump(exclude_none=True)
+    
+    def to_fhir_bytes(self) -> bytes:
+        """Serialize to FHIR-compliant JSON bytes in a single pydantic-core pass."""
+        return self.__pydantic_serializer__.to_json(self, exclude_none=True)
 
 
-def create_screening_bundle(
+def _screening_resources(
     patient_id: str,
     age: int,
     sex: str,
     symptoms: list[dict],
     assessment: Optional[dict] = None
-) -> FHIRBundle:
-    """
-    Create a FHIR Bundle containing the complete screening encounter.
-    
-    Args:
-        patient_id: Patient identifier
-        age: Patient age
-        sex: Patient sex
-        symptoms: List of symptom dicts with name, present, severity, duration_days
-        assessment: Optional assessment dict with risk_level, conditions, etc.
-        
-    Returns:
-        FHIRBundle containing Patient, Observations, and optionally RiskAssessment
-    """
-    bundle = FHIRBundle()
-    
+) -> Iterator[BaseModel]:
+    """Yield the Patient, symptom Observations and optional RiskAssessment in bundle order."""
     # Create Patient
-    patient = FHIRPatient.from_screening_data(patient_id, age, sex)
-    bundle.add_resource(patient)
+    yield FHIRPatient.from_screening_data(patient_id, age, sex)
     
     # Create Observations for each symptom
     observation_ids = []
@@ -494,12 +492,12 @@ def create_screening_bundle(
             duration_days=symptom.get("duration_days"),
             patient_ref=patient_id
         )
-        bundle.add_resource(obs)
+        yield obs
         observation_ids.append(obs.id)
     
     # Create RiskAssessment if provided
     if assessment:
-        risk_assessment = FHIRRiskAssessment.from_assessment(
+        yield FHIRRiskAssessment.from_assessment(
             risk_level=assessment.get("risk_level", "MODERATE"),
             likely_conditions=assessment.get("likely_conditions", []),
             reasoning=assessment.get("reasoning", ""),
@@ -509,6 +507,69 @@ def create_screening_bundle(
             patient_ref=patient_id,
             observation_refs=observation_ids
         )
-        bundle.add_resource(risk_assessment)
+
+
+def create_screening_bundle(
+    patient_id: str,
+    age: int,
+    sex: str,
+    symptoms: list[dict],
+    assessment: Optional[dict] = None
+) -> FHIRBundle:
+    """
+    Create a FHIR Bundle containing the complete screening encounter.
     
+    Args:
+        patient_id: Patient identifier
+        age: Patient age
+        sex: Patient sex
+        symptoms: List of symptom dicts with name, present, severity, duration_days
+        assessment: Optional assessment dict with risk_level, conditions, etc.
+        
+    Returns:
+        FHIRBundle containing Patient, Observations, and optionally RiskAssessment
+    """
+    bundle = FHIRBundle()
+    for resource in _screening_resources(patient_id, age, sex, symptoms, assessment):
+        bundle.add_resource(resource)
     return bundle
+
+
+def stream_screening_bundle(
+    write: Callable[[bytes], Any],
+    patient_id: str,
+    age: int,
+    sex: str,
+    symptoms: list[dict],
+    assessment: Optional[dict] = None
+) -> int:
+    """
+    Stream the screening encounter as FHIR Bundle JSON, one entry at a time.
+    
+    Produces the same document as create_screening_bundle(...).to_fhir_bytes(),
+    but each resource is serialized and handed to ``write`` as soon as it is
+    built, so the full bundle never has to exist in memory.
+    
+    Args:
+        write: Callable receiving successive chunks of bytes
+            (e.g. ``bytearray().extend`` or a binary file's ``write``)
+        patient_id, age, sex, symptoms, assessment: As for create_screening_bundle
+        
+    Returns:
+        Number of resources written
+    """
+    bundle = FHIRBundle()
+    header = bundle.__pydantic_serializer__.to_json(bundle, exclude={"entry"}, exclude_none=True)
+    write(header[:-1] + b',"entry":[')
+    
+    count = 0
+    for resource in _screening_resources(patient_id, age, sex, symptoms, assessment):
+        if count:
+            write(b",")
+        write(b'{"fullUrl":' + to_json(f"urn:uuid:{resource.id}") + b',"resource":')
+        write(resource.__pydantic_serializer__.to_json(resource, exclude_none=True))
+        write(b"}")
+        count += 1
+    
+    write(b"]}")
+    return count
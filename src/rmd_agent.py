@@ -37,6 +37,7 @@ from src.data_models import PatientScreening, RMDAssessment
 from src.fhir_resources import (
     FHIRBundle, create_screening_bundle
 )
+from src.utils import extract_json_from_response
 
 # Load environment variables
 load_dotenv()
@@ -457,19 +458,22 @@ class RMDScreeningAgent:
     - Explainable decision-making
     """
     
+    # Model and tool registry are fixed at import and shared by all instances,
+    # so they can be inspected without constructing an agent
+    MODEL_NAME = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant")
+    TOOLS = (
+        analyze_inflammatory_markers,
+        analyze_joint_pattern,
+        analyze_systemic_symptoms,
+        calculate_risk_score,
+        get_differential_diagnosis,
+    )
+    
     def __init__(self, api_key: Optional[str] = None):
         """Initialize the agent with API credentials."""
         self.api_key = api_key or os.getenv("GROQ_API_KEY")
-        self.model_name = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant")
-        
-        # Define available tools
-        self.tools = [
-            analyze_inflammatory_markers,
-            analyze_joint_pattern,
-            analyze_systemic_symptoms,
-            calculate_risk_score,
-            get_differential_diagnosis,
-        ]
+        self.model_name = self.MODEL_NAME
+        self.tools = list(self.TOOLS)
         
         # Initialize LLM if configured
         self.llm = None
@@ -534,7 +538,16 @@ After using tools, provide your final answer as valid JSON:
     
     def is_configured(self) -> bool:
         """Check if the agent is properly configured with API key."""
-        return self.api_key is not None and len(self.api_key) > 10
+        return self._is_valid_key(self.api_key)
+    
+    @classmethod
+    def has_env_key(cls) -> bool:
+        """Check GROQ_API_KEY without constructing an agent (or LLM client)."""
+        return cls._is_valid_key(os.environ.get("GROQ_API_KEY"))
+    
+    @staticmethod
+    def _is_valid_key(api_key: Optional[str]) -> bool:
+        return api_key is not None and len(api_key) > 10
     
     def _prepare_patient_json(self, patient: PatientScreening) -> str:
         """Convert patient data to JSON for tool input."""
@@ -632,31 +645,15 @@ Use the available tools to analyze this patient, then provide your final assessm
             )
     
     def _extract_json_from_response(self, text: str) -> Optional[dict]:
-        """Extract JSON from the agent's response."""
-        import re
-        
-        # Try to find JSON in code blocks
-        json_patterns = [
-            r'```json\s*([\s\S]*?)\s*```',
-            r'```\s*([\s\S]*?)\s*```',
-            r'\{[\s\S]*\}',
-        ]
-        
-        for pattern in json_patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
-                try:
-                    return json.loads(match.strip())
-                except:
-                    continue
-        
-        # Try direct parse
-        try:
-            return json.loads(text.strip())
-        except:
-            pass
+        """
+        Extract JSON from the agent's response.
         
-        return None
+        Delegates to utils.extract_json_from_response, which uses orjson
+        when installed. Only JSON objects are accepted, since the caller
+        adds tools_used to the result.
+        """
+        data = extract_json_from_response(text)
+        return data if isinstance(data, dict) else None
     
     def _create_assessment_from_dict(
         self, 
@@ -9,15 +9,32 @@ This module provides utility functions for:
 - Error handling helpers
 """
 
+import importlib.util
 import json
 import re
 import os
 from typing import Optional, Any
 from datetime import datetime
+from functools import lru_cache
 
 from src.data_models import PatientScreening, RMDAssessment, Symptom
 
+# orjson parses LLM responses several times faster than the stdlib; it is
+# optional, so fall back to json when it isn't installed.
+try:
+    import orjson
+    _loads = orjson.loads
+    _JSONDecodeError = orjson.JSONDecodeError
+except ImportError:
+    _loads = json.loads
+    _JSONDecodeError = json.JSONDecodeError
 
+# Checked once so load_api_key never pays for importing Streamlit when it
+# isn't installed
+_HAS_STREAMLIT = importlib.util.find_spec("streamlit") is not None
+
+
+@lru_cache(maxsize=1)
 def load_api_key() -> str:
     """
     Load the Groq API key from environment variables or Streamlit secrets.
@@ -26,6 +43,8 @@ def load_api_key() -> str:
     - Local: .env file with GROQ_API_KEY
     - Streamlit Cloud: secrets.toml with GROQ_API_KEY
     
+    The key is looked up once per process and then cached.
+    
     Returns:
         The API key string
         
@@ -35,11 +54,12 @@ def load_api_key() -> str:
     api_key = None
     
     # Try Streamlit secrets first (for Streamlit Cloud deployment)
-    try:
-        import streamlit as st
-        api_key = st.secrets.get("GROQ_API_KEY")
-    except Exception:
-        pass
+    if _HAS_STREAMLIT:
+        try:
+            import streamlit as st
+            api_key = st.secrets.get("GROQ_API_KEY")
+        except Exception:
+            pass
     
     # Fall back to environment variable (for local development)
     if not api_key:
@@ -79,11 +99,14 @@ def extract_json_from_response(text: str) -> Optional[dict]:
     Returns:
         Parsed JSON as dict, or None if parsing fails
     """
-    # Try direct JSON parse first
-    try:
-        return json.loads(text.strip())
-    except json.JSONDecodeError:
-        pass
+    # Try direct JSON parse first, but only when the text could be JSON -
+    # replies prefixed with prose would just raise and be caught
+    stripped = text.strip()
+    if stripped[:1] in ("{", "["):
+        try:
+            return _loads(stripped)
+        except _JSONDecodeError:
+            pass
     
     # Try to extract JSON from markdown code blocks
     json_patterns = [
@@ -98,13 +121,33 @@ def extract_json_from_response(text: str) -> Optional[dict]:
             try:
                 # Clean up the match
                 cleaned = match.strip()
-                return json.loads(cleaned)
-            except json.JSONDecodeError:
+                return _loads(cleaned)
+            except _JSONDecodeError:
                 continue
     
     return None
 
 
+# Required RMDAssessment fields and their expected types, with the error
+# messages pre-built so validation only formats the offending type.
+_REQUIRED = (
+    ("risk_level", str),
+    ("likely_conditions", list),
+    ("reasoning", str),
+    ("recommended_next_step", str),
+    ("confidence_score", (int, float)),
+)
+_REQUIRED_FIELDS = tuple(
+    (
+        field,
+        expected_type,
+        f"Missing required field: {field}",
+        f"Invalid type for {field}: expected {expected_type}, got {{}}",
+    )
+    for field, expected_type in _REQUIRED
+)
+
+
 def validate_assessment_dict(data: dict) -> tuple[bool, list[str]]:
     """
     Validate that a dictionary has all required fields for RMDAssessment.
@@ -116,19 +159,12 @@ def validate_assessment_dict(data: dict) -> tuple[bool, list[str]]:
         Tuple of (is_valid, list_of_errors)
     """
     errors = []
-    required_fields = {
-        "risk_level": str,
-        "likely_conditions": list,
-        "reasoning": str,
-        "recommended_next_step": str,
-        "confidence_score": (int, float)
-    }
-    
-    for field, expected_type in required_fields.items():
+    
+    for field, expected_type, missing_msg, invalid_msg in _REQUIRED_FIELDS:
         if field not in data:
-            errors.append(f"Missing required field: {field}")
+            errors.append(missing_msg)
         elif not isinstance(data[field], expected_type):
-            errors.append(f"Invalid type for {field}: expected {expected_type}, got {type(data[field])}")
+            errors.append(invalid_msg.format(type(data[field])))
     
     # Validate risk_level values
     if "risk_level" in data and data["risk_level"] not in ["LOW", "MODERATE", "HIGH"]:
@@ -143,6 +179,30 @@ def validate_assessment_dict(data: dict) -> tuple[bool, list[str]]:
     return len(errors) == 0, errors
 
 
+def _sym_index(patient: PatientScreening) -> dict[str, Symptom]:
+    """
+    Build a name -> Symptom index for the patient.
+    
+    Mirrors PatientScreening.get_symptom (case-insensitive, first match
+    wins) but with O(1) lookups. The index is rebuilt on every call; it
+    is only a handful of entries, and caching it on the model went stale
+    when a symptom was replaced in place.
+    """
+    index = {}
+    for symptom in patient.symptoms:
+        index.setdefault(symptom.name.lower(), symptom)
+    return index
+
+
+# Pattern messages with a variable part, formatted in check_rmd_patterns
+_MSG_STIFF_DUR = "MORNING STIFFNESS: Present for {} minutes - significant (>30 min suggests inflammatory)"
+_MSG_STIFF_SEV = "MORNING STIFFNESS: Severity {}/10 - moderate to severe"
+_MSG_SYSTEMIC = "SYSTEMIC: {} systemic symptoms present - concerning for systemic inflammatory disease"
+_MSG_YOUNG_ADULT = "YOUNG ADULT ({}y): Consider inflammatory spondyloarthropathy, RA, or reactive arthritis"
+_MSG_OLDER_ADULT = "OLDER ADULT ({}y): Consider PMR, late-onset RA, or OA with inflammatory overlay"
+_MSG_RED_FLAG = "  ⚠️ {}"
+
+
 def check_rmd_patterns(patient: PatientScreening) -> str:
     """
     Analyze patient data for RMD-specific patterns.
@@ -158,25 +218,29 @@ def check_rmd_patterns(patient: PatientScreening) -> str:
     """
     patterns = []
     red_flags = []
+    symptoms = _sym_index(patient)
     
     # Check for polyarticular involvement
-    multiple_joints = patient.get_symptom("multiple_joints_affected")
+    multiple_joints = symptoms.get("multiple_joints_affected")
     if multiple_joints and multiple_joints.present:
         patterns.append("POLYARTICULAR: Multiple joints affected - concerning for inflammatory arthritis")
         red_flags.append("Multiple joint involvement")
     
     # Check morning stiffness
-    morning_stiffness = patient.get_symptom("morning_stiffness")
-    if morning_stiffness and morning_stiffness.present:
-        if morning_stiffness.duration_days and morning_stiffness.duration_days > 30:
-            patterns.append(f"MORNING STIFFNESS: Present for {morning_stiffness.duration_days} minutes - significant (>30 min suggests inflammatory)")
+    morning_stiffness = symptoms.get("morning_stiffness")
+    stiffness_present = morning_stiffness is not None and morning_stiffness.present
+    if stiffness_present:
+        duration = morning_stiffness.duration_days
+        severity = morning_stiffness.severity
+        if duration and duration > 30:
+            patterns.append(_MSG_STIFF_DUR.format(duration))
             red_flags.append("Prolonged morning stiffness")
-        elif morning_stiffness.severity and morning_stiffness.severity >= 5:
-            patterns.append(f"MORNING STIFFNESS: Severity {morning_stiffness.severity}/10 - moderate to severe")
+        elif severity and severity >= 5:
+            patterns.append(_MSG_STIFF_SEV.format(severity))
     
     # Check for inflammatory signs
-    swelling = patient.get_symptom("joint_swelling")
-    redness = patient.get_symptom("joint_redness")
+    swelling = symptoms.get("joint_swelling")
+    redness = symptoms.get("joint_redness")
     if swelling and swelling.present:
         if redness and redness.present:
             patterns.append("INFLAMMATORY SIGNS: Both swelling and redness present - active inflammation likely")
@@ -185,9 +249,9 @@ def check_rmd_patterns(patient: PatientScreening) -> str:
             patterns.append("JOINT SWELLING: Present - possible inflammatory component")
     
     # Check for systemic symptoms
-    fever = patient.get_symptom("fever")
-    weight_loss = patient.get_symptom("weight_loss")
-    fatigue = patient.get_symptom("fatigue")
+    fever = symptoms.get("fever")
+    weight_loss = symptoms.get("weight_loss")
+    fatigue = symptoms.get("fatigue")
     
     systemic_count = sum([
         1 for s in [fever, weight_loss, fatigue]
@@ -195,23 +259,24 @@ def check_rmd_patterns(patient: PatientScreening) -> str:
     ])
     
     if systemic_count >= 2:
-        patterns.append(f"SYSTEMIC: {systemic_count} systemic symptoms present - concerning for systemic inflammatory disease")
+        patterns.append(_MSG_SYSTEMIC.format(systemic_count))
         red_flags.append("Multiple systemic symptoms")
     elif fever and fever.present:
         patterns.append("FEVER: Present - consider infectious or inflammatory cause")
         red_flags.append("Fever with joint symptoms")
     
     # Age-related patterns
-    if patient.age < 40:
-        joint_pain = patient.get_symptom("joint_pain")
+    age = patient.age
+    if age < 40:
+        joint_pain = symptoms.get("joint_pain")
         if joint_pain and joint_pain.present:
-            patterns.append(f"YOUNG ADULT ({patient.age}y): Consider inflammatory spondyloarthropathy, RA, or reactive arthritis")
-    elif patient.age >= 50:
-        if fatigue and fatigue.present and (swelling or (morning_stiffness and morning_stiffness.present)):
-            patterns.append(f"OLDER ADULT ({patient.age}y): Consider PMR, late-onset RA, or OA with inflammatory overlay")
+            patterns.append(_MSG_YOUNG_ADULT.format(age))
+    elif age >= 50:
+        if fatigue and fatigue.present and (swelling or stiffness_present):
+            patterns.append(_MSG_OLDER_ADULT.format(age))
     
     # Skin involvement
-    rash = patient.get_symptom("skin_rash")
+    rash = symptoms.get("skin_rash")
     if rash and rash.present:
         patterns.append("SKIN INVOLVEMENT: Rash present - consider psoriatic arthritis, SLE, or reactive arthritis")
         red_flags.append("Skin rash with joint symptoms")
@@ -227,11 +292,23 @@ def check_rmd_patterns(patient: PatientScreening) -> str:
         summary_lines.append("")
         summary_lines.append("RED FLAGS IDENTIFIED:")
         for flag in red_flags:
-            summary_lines.append(f"  ⚠️ {flag}")
+            summary_lines.append(_MSG_RED_FLAG.format(flag))
     
     return "\n".join(summary_lines)
 
 
+# (confidence bonus, confidence ceiling) indexed by present-symptom count,
+# with 5 standing for "5 or more"
+_SYMPTOM_COUNT_ADJUSTMENT = (
+    (-0.15, 0.95),
+    (0.0, 0.95),
+    (0.0, 0.95),
+    (0.05, 0.90),
+    (0.05, 0.90),
+    (0.10, 0.95),
+)
+
+
 def calculate_basic_risk_score(patient: PatientScreening) -> tuple[str, float]:
     """
     Calculate a basic rule-based risk score as a fallback.
@@ -252,22 +329,24 @@ def calculate_basic_risk_score(patient: PatientScreening) -> tuple[str, float]:
     risk_score = 0
     confidence_factors = 0
     max_confidence_factors = 0
+    symptoms = _sym_index(patient)
     
     # Joint pain is baseline
-    joint_pain = patient.get_symptom("joint_pain")
+    joint_pain = symptoms.get("joint_pain")
     if joint_pain:
         max_confidence_factors += 2  # presence + severity
         if joint_pain.present:
             risk_score += 1
             confidence_factors += 1
-            if joint_pain.severity is not None:
+            severity = joint_pain.severity
+            if severity is not None:
                 confidence_factors += 1
                 # Higher severity increases risk
-                if joint_pain.severity >= 7:
+                if severity >= 7:
                     risk_score += 1
     
     # Multiple joints is concerning
-    multiple_joints = patient.get_symptom("multiple_joints_affected")
+    multiple_joints = symptoms.get("multiple_joints_affected")
     if multiple_joints:
         max_confidence_factors += 1
         if multiple_joints.present:
@@ -275,28 +354,29 @@ def calculate_basic_risk_score(patient: PatientScreening) -> tuple[str, float]:
             confidence_factors += 1
     
     # Morning stiffness
-    morning_stiffness = patient.get_symptom("morning_stiffness")
+    morning_stiffness = symptoms.get("morning_stiffness")
     if morning_stiffness:
         max_confidence_factors += 2  # presence + duration
         if morning_stiffness.present:
             risk_score += 2
             confidence_factors += 1
-            if morning_stiffness.duration_days is not None:
+            duration = morning_stiffness.duration_days
+            if duration is not None:
                 confidence_factors += 1
-                if morning_stiffness.duration_days > 30:
+                if duration > 30:
                     risk_score += 2
-                elif morning_stiffness.duration_days > 60:
+                elif duration > 60:
                     risk_score += 3
     
     # Inflammatory signs
-    swelling = patient.get_symptom("joint_swelling")
+    swelling = symptoms.get("joint_swelling")
     if swelling:
         max_confidence_factors += 1
         if swelling.present:
             risk_score += 2
             confidence_factors += 1
     
-    redness = patient.get_symptom("joint_redness")
+    redness = symptoms.get("joint_redness")
     if redness:
         max_confidence_factors += 1
         if redness.present:
@@ -304,32 +384,33 @@ def calculate_basic_risk_score(patient: PatientScreening) -> tuple[str, float]:
             confidence_factors += 1
     
     # Systemic symptoms
-    fever = patient.get_symptom("fever")
+    fever = symptoms.get("fever")
     if fever:
         max_confidence_factors += 1
         if fever.present:
             risk_score += 2
             confidence_factors += 1
     
-    weight_loss = patient.get_symptom("weight_loss")
+    weight_loss = symptoms.get("weight_loss")
     if weight_loss:
         max_confidence_factors += 1
         if weight_loss.present:
             risk_score += 1
             confidence_factors += 1
     
-    fatigue = patient.get_symptom("fatigue")
+    fatigue = symptoms.get("fatigue")
     if fatigue:
         max_confidence_factors += 2  # presence + severity
         if fatigue.present:
             risk_score += 1
             confidence_factors += 1
-            if fatigue.severity is not None:
+            severity = fatigue.severity
+            if severity is not None:
                 confidence_factors += 1
-                if fatigue.severity >= 7:
+                if severity >= 7:
                     risk_score += 1
     
-    skin_rash = patient.get_symptom("skin_rash")
+    skin_rash = symptoms.get("skin_rash")
     if skin_rash:
         max_confidence_factors += 1
         if skin_rash.present:
@@ -352,12 +433,8 @@ def calculate_basic_risk_score(patient: PatientScreening) -> tuple[str, float]:
     
     # Adjust confidence based on symptom count (more symptoms = clearer picture)
     symptom_count = sum(1 for s in patient.symptoms if s.present)
-    if symptom_count >= 5:
-        confidence = min(0.95, confidence + 0.10)
-    elif symptom_count >= 3:
-        confidence = min(0.90, confidence + 0.05)
-    elif symptom_count == 0:
-        confidence = max(0.30, confidence - 0.15)
+    bonus, ceiling = _SYMPTOM_COUNT_ADJUSTMENT[min(symptom_count, 5)]
+    confidence = min(ceiling, max(0.30, confidence + bonus))
     
     # Round to 2 decimal places
     confidence = round(confidence, 2)
@@ -371,6 +448,17 @@ def calculate_basic_risk_score(patient: PatientScreening) -> tuple[str, float]:
         return "LOW", confidence
 
 
+# Fixed parts of the fallback assessment; only the error message varies
+_FALLBACK_REASON_TMPL = (
+    "Automated analysis encountered an issue: {err}. "
+    "A basic rule-based assessment was performed. "
+    "This patient should be reviewed by a healthcare professional."
+)
+_FALLBACK_CONDITIONS = ("Unable to determine - requires clinical review",)
+_FALLBACK_NEXT_STEP = "Schedule GP consultation for proper clinical evaluation"
+_FALLBACK_RED_FLAGS = ("System unable to perform full analysis - clinical review required",)
+
+
 def create_fallback_assessment(patient: PatientScreening, error_msg: str) -> RMDAssessment:
     """
     Create a fallback assessment when the LLM fails.
@@ -389,13 +477,11 @@ def create_fallback_assessment(patient: PatientScreening, error_msg: str) -> RMD
     
     return RMDAssessment(
         risk_level=risk_level,
-        likely_conditions=["Unable to determine - requires clinical review"],
-        reasoning=f"Automated analysis encountered an issue: {error_msg}. "
-                  f"A basic rule-based assessment was performed. "
-                  f"This patient should be reviewed by a healthcare professional.",
-        recommended_next_step="Schedule GP consultation for proper clinical evaluation",
+        likely_conditions=_FALLBACK_CONDITIONS,
+        reasoning=_FALLBACK_REASON_TMPL.format(err=error_msg),
+        recommended_next_step=_FALLBACK_NEXT_STEP,
         confidence_score=confidence,
-        red_flags_identified=["System unable to perform full analysis - clinical review required"],
+        red_flags_identified=_FALLBACK_RED_FLAGS,
         assessment_timestamp=datetime.now()
     )
 
@@ -404,8 +490,8 @@ def format_duration(minutes: int) -> str:
     """Format duration in minutes to a readable string."""
     if minutes < 60:
         return f"{minutes} minutes"
-    elif minutes == 60:
-        return "1 hour"
+    hours, remainder = divmod(minutes, 60)
+    if not remainder:
+        return "1 hour" if hours == 1 else f"{hours} hours"
     else:
-        hours = minutes / 60
-        return f"{hours:.1f} hours"
+        return f"{minutes / 60:.1f} hours"
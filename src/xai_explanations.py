@@ -16,13 +16,45 @@ Based on XAI best practices for healthcare AI:
 Reference: NHS Digital Technology Assessment Criteria (DTAC)
 """
 
-from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Literal, Optional
-from enum import Enum
+from dataclasses import asdict, dataclass, field, fields, is_dataclass
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Callable, Mapping, Optional
+from enum import Enum, IntEnum
+from functools import partial
+from operator import itemgetter
+import io
 import json
 import hashlib
 
+import numpy as np
+
+# orjson is optional: it serializes the audit-hash payload straight to
+# bytes, several times faster than the stdlib encoder.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+else:
+    _ORJSON_HASH_OPTIONS = (
+        orjson.OPT_SORT_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+# BLAKE3 is optional: the input hash is an audit identifier rather than a
+# security control, so use the faster SIMD hash when it is installed.
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+INPUT_HASH_ALGORITHM = "BLAKE3" if blake3 is not None else "SHA256"
+
+
+# Version of the attribution/explanation logic, recorded in the audit trail
+MODEL_VERSION = "rmd-agent-v2.0.0"
+
 
 class UserRole(str, Enum):
     """User roles with different explanation needs."""
@@ -31,7 +63,26 @@ class UserRole(str, Enum):
     AUDITOR = "auditor"
 
 
-@dataclass
+class Direction(IntEnum):
+    """Direction of a feature's effect on risk; compares as a plain int."""
+    INCREASES = 1
+    DECREASES = -1
+    NEUTRAL = 0
+    
+    @property
+    def label(self) -> str:
+        """Display label, e.g. "increases_risk"."""
+        return _DIRECTION_LABELS[self]
+
+
+_DIRECTION_LABELS = {
+    Direction.INCREASES: "increases_risk",
+    Direction.DECREASES: "decreases_risk",
+    Direction.NEUTRAL: "neutral",
+}
+
+
+@dataclass(slots=True, frozen=True)
 class FeatureContribution:
     """
     LIME/SHAP-style feature contribution to the risk assessment.
@@ -40,12 +91,12 @@ class FeatureContribution:
     feature_name: str
     feature_value: str
     contribution_score: float  # -1.0 to +1.0
-    contribution_direction: Literal["increases_risk", "decreases_risk", "neutral"]
+    contribution_direction: Direction
     clinical_significance: str
     plain_language: str  # Patient-friendly explanation
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ReasoningStep:
     """
     A single step in the agent's reasoning trace.
@@ -60,7 +111,7 @@ class ReasoningStep:
     duration_ms: int = 0
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AuditEntry:
     """
     Complete audit trail entry for regulatory compliance.
@@ -72,11 +123,11 @@ class AuditEntry:
     details: dict
     input_hash: Optional[str] = None
     output_hash: Optional[str] = None
-    model_version: str = "rmd-agent-v2.0.0"
+    model_version: str = MODEL_VERSION
     system_version: str = "RMD-Health-Demo-v2.0"
 
 
-@dataclass
+@dataclass(slots=True)
 class XAIExplanation:
     """
     Complete XAI explanation package with views for all user types.
@@ -96,23 +147,166 @@ class XAIExplanation:
     # Audit entries
     audit_trail: list[AuditEntry] = field(default_factory=list)
     
-    # Pre-rendered explanations for each role
-    clinician_summary: str = ""
-    patient_summary: str = ""
-    auditor_summary: str = ""
-    
     # Counterfactual explanations
     counterfactuals: list[str] = field(default_factory=list)
     
     # Key findings
     key_factors: list[str] = field(default_factory=list)
     red_flags: list[str] = field(default_factory=list)
+    
+    # Role explanations are rendered on first access and then kept
+    renderers: dict[UserRole, Callable[[], str]] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    _summaries: dict[UserRole, str] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    
+    # (features, reasoning steps, audit entries, counterfactuals), fixed at
+    # construction since the explanation is not extended afterwards
+    counts: tuple[int, int, int, int] = field(
+        init=False, repr=False, compare=False
+    )
+    
+    def __post_init__(self):
+        self.counts = (
+            len(self.feature_contributions),
+            len(self.reasoning_steps),
+            len(self.audit_trail),
+            len(self.counterfactuals),
+        )
+    
+    def summary(self, role: UserRole) -> str:
+        """Return the explanation for a role, rendering it on first use."""
+        text = self._summaries.get(role)
+        if text is None:
+            renderer = self.renderers.get(role)
+            text = self._summaries[role] = renderer() if renderer else ""
+        return text
+    
+    @property
+    def clinician_summary(self) -> str:
+        return self.summary(UserRole.CLINICIAN)
+    
+    @property
+    def patient_summary(self) -> str:
+        return self.summary(UserRole.PATIENT)
+    
+    @property
+    def auditor_summary(self) -> str:
+        return self.summary(UserRole.AUDITOR)
+    
+    def to_dict(self) -> dict:
+        """Plain-dict form for archival, with all role explanations rendered."""
+        data = {}
+        for f in fields(self):
+            if f.name in ("renderers", "_summaries", "counts"):
+                continue
+            value = getattr(self, f.name)
+            if isinstance(value, list):
+                value = [asdict(item) if is_dataclass(item) else item for item in value]
+            data[f.name] = value
+        # Archived records keep the "increases_risk"-style direction labels
+        for contribution in data["feature_contributions"]:
+            contribution["contribution_direction"] = contribution["contribution_direction"].label
+        data["clinician_summary"] = self.clinician_summary
+        data["patient_summary"] = self.patient_summary
+        data["auditor_summary"] = self.auditor_summary
+        return data
 
 
 def generate_input_hash(patient_data: dict) -> str:
-    """Generate SHA-256 hash of input data for audit purposes."""
-    data_str = json.dumps(patient_data, sort_keys=True, default=str)
-    return hashlib.sha256(data_str.encode()).hexdigest()[:16]
+    """
+    Generate a 16-hex-character hash of input data for audit purposes.
+    
+    Uses BLAKE3 when installed and SHA-256 otherwise; INPUT_HASH_ALGORITHM
+    names the one in use.
+    
+    For plain JSON types (str keys; str, int, finite float, bool, None,
+    lists and dicts), datetimes and dataclasses, the serialized bytes and
+    so the hash are the same whether or not orjson is installed. Plain
+    Enum members and NaN/infinity may hash differently between the two.
+    """
+    data = None
+    if orjson is not None:
+        try:
+            # Datetimes and dataclasses go through default=str like the
+            # stdlib path (e.g. "2026-01-01 09:30:00", not orjson's ISO "T")
+            data = orjson.dumps(
+                patient_data,
+                option=_ORJSON_HASH_OPTIONS,
+                default=str
+            )
+        except TypeError:
+            # Non-str keys and integers beyond 64 bits are left to the
+            # stdlib, which sorts and encodes them its own way
+            pass
+    if data is None:
+        data = json.dumps(
+            patient_data, sort_keys=True, separators=(",", ":"),
+            ensure_ascii=False, default=str
+        ).encode()
+    if blake3 is not None:
+        return blake3.blake3(data).hexdigest(length=8)
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+# Symptom attribution weights: name -> (base score, clinical significance,
+# plain-language explanation). Read-only so callers cannot mutate it.
+_SYMPTOM_WEIGHTS: Mapping[str, tuple[float, str, str]] = MappingProxyType({
+    "joint_pain": (
+        0.15,
+        "Joint pain is the primary presenting symptom in RMDs",
+        "Joint pain is something we take seriously and want to investigate",
+    ),
+    "multiple_joints_affected": (
+        0.25,
+        "Polyarticular involvement suggests inflammatory arthritis (RA, PsA)",
+        "Having pain in several joints at once can be a sign of certain conditions",
+    ),
+    "morning_stiffness": (
+        0.20,
+        "Morning stiffness >30min is characteristic of inflammatory arthritis",
+        "Stiffness in the morning that takes time to improve is something we look out for",
+    ),
+    "joint_swelling": (
+        0.22,
+        "Synovitis (joint swelling) indicates active inflammation",
+        "Swelling in your joints shows there may be inflammation we need to address",
+    ),
+    "joint_redness": (
+        0.18,
+        "Erythema suggests acute inflammatory process",
+        "Redness around joints can indicate inflammation",
+    ),
+    "fatigue": (
+        0.10,
+        "Constitutional symptoms suggest systemic inflammatory disease",
+        "Feeling very tired can sometimes be linked to inflammation in the body",
+    ),
+    "fever": (
+        0.15,
+        "Fever with joint symptoms requires urgent evaluation",
+        "A fever along with joint problems needs quick attention",
+    ),
+    "skin_rash": (
+        0.18,
+        "Skin involvement suggests PsA, SLE, or dermatomyositis",
+        "Skin changes can sometimes be connected to joint conditions",
+    ),
+    "weight_loss": (
+        0.12,
+        "Unexplained weight loss suggests systemic disease",
+        "Losing weight without trying can be a sign your body is dealing with something",
+    ),
+})
+_KNOWN_SYMPTOMS = frozenset(_SYMPTOM_WEIGHTS)
+
+# Display names for the fixed symptom set, e.g. "joint_pain" -> "Joint Pain"
+_DISPLAY_NAMES: Mapping[str, str] = MappingProxyType({
+    name: name.replace("_", " ").title() for name in _SYMPTOM_WEIGHTS
+})
+_PRESENT = "Present"
 
 
 def calculate_feature_contributions(
@@ -135,7 +329,7 @@ def calculate_feature_contributions(
             feature_name="Age",
             feature_value=f"{age} years",
             contribution_score=0.1,
-            contribution_direction="increases_risk",
+            contribution_direction=Direction.INCREASES,
             clinical_significance="Age ≥50 increases risk of inflammatory conditions like PMR",
             plain_language="Your age means we want to be extra careful to check for certain conditions"
         ))
@@ -144,7 +338,7 @@ def calculate_feature_contributions(
             feature_name="Age",
             feature_value=f"{age} years",
             contribution_score=-0.05,
-            contribution_direction="decreases_risk",
+            contribution_direction=Direction.DECREASES,
             clinical_significance="Younger age reduces risk of degenerative conditions",
             plain_language="Your age is a positive factor in this assessment"
         ))
@@ -155,104 +349,196 @@ def calculate_feature_contributions(
             feature_name="Sex",
             feature_value=sex,
             contribution_score=0.08,
-            contribution_direction="increases_risk",
+            contribution_direction=Direction.INCREASES,
             clinical_significance="Female sex increases RA risk (3:1 female:male ratio)",
             plain_language="Some conditions are slightly more common in women"
         ))
     
     # Symptom contributions
-    symptom_weights = {
-        "joint_pain": {
-            "base_score": 0.15,
-            "clinical": "Joint pain is the primary presenting symptom in RMDs",
-            "plain": "Joint pain is something we take seriously and want to investigate"
-        },
-        "multiple_joints_affected": {
-            "base_score": 0.25,
-            "clinical": "Polyarticular involvement suggests inflammatory arthritis (RA, PsA)",
-            "plain": "Having pain in several joints at once can be a sign of certain conditions"
-        },
-        "morning_stiffness": {
-            "base_score": 0.20,
-            "clinical": "Morning stiffness >30min is characteristic of inflammatory arthritis",
-            "plain": "Stiffness in the morning that takes time to improve is something we look out for"
-        },
-        "joint_swelling": {
-            "base_score": 0.22,
-            "clinical": "Synovitis (joint swelling) indicates active inflammation",
-            "plain": "Swelling in your joints shows there may be inflammation we need to address"
-        },
-        "joint_redness": {
-            "base_score": 0.18,
-            "clinical": "Erythema suggests acute inflammatory process",
-            "plain": "Redness around joints can indicate inflammation"
-        },
-        "fatigue": {
-            "base_score": 0.10,
-            "clinical": "Constitutional symptoms suggest systemic inflammatory disease",
-            "plain": "Feeling very tired can sometimes be linked to inflammation in the body"
-        },
-        "fever": {
-            "base_score": 0.15,
-            "clinical": "Fever with joint symptoms requires urgent evaluation",
-            "plain": "A fever along with joint problems needs quick attention"
-        },
-        "skin_rash": {
-            "base_score": 0.18,
-            "clinical": "Skin involvement suggests PsA, SLE, or dermatomyositis",
-            "plain": "Skin changes can sometimes be connected to joint conditions"
-        },
-        "weight_loss": {
-            "base_score": 0.12,
-            "clinical": "Unexplained weight loss suggests systemic disease",
-            "plain": "Losing weight without trying can be a sign your body is dealing with something"
-        }
-    }
-    
     for symptom in symptoms:
+        # Absent symptoms never contribute, so skip them before any lookups
+        if not symptom.get("present", False):
+            continue
         name = symptom.get("name", "")
-        present = symptom.get("present", False)
+        if name not in _KNOWN_SYMPTOMS:
+            continue
+        
+        base_score, clinical, plain = _SYMPTOM_WEIGHTS[name]
         severity = symptom.get("severity")
         duration_days = symptom.get("duration_days")
         duration_minutes = symptom.get("duration_minutes")
         
-        if name in symptom_weights and present:
-            weight_info = symptom_weights[name]
-            base_score = weight_info["base_score"]
-            
-            # Adjust score based on severity and duration
-            score = base_score
-            if severity and severity >= 7:
-                score *= 1.3
-            if duration_days and duration_days > 30:
-                score *= 1.2
-            # Morning stiffness > 30 mins is significant
-            if duration_minutes and duration_minutes > 30:
-                score *= 1.2
-            
-            value_parts = ["Present"]
+        # Adjust score based on severity and duration
+        score = base_score
+        if severity and severity >= 7:
+            score *= 1.3
+        if duration_days and duration_days > 30:
+            score *= 1.2
+        # Morning stiffness > 30 mins is significant
+        if duration_minutes and duration_minutes > 30:
+            score *= 1.2
+        
+        if severity or duration_days or duration_minutes:
+            value_parts = [_PRESENT]
             if severity:
                 value_parts.append(f"Severity: {severity}/10")
             if duration_days:
                 value_parts.append(f"Duration: {duration_days} days")
             if duration_minutes:
                 value_parts.append(f"Duration: {duration_minutes} minutes")
-            
-            contributions.append(FeatureContribution(
-                feature_name=name.replace("_", " ").title(),
-                feature_value=", ".join(value_parts),
-                contribution_score=round(min(score, 0.35), 2),
-                contribution_direction="increases_risk",
-                clinical_significance=weight_info["clinical"],
-                plain_language=weight_info["plain"]
-            ))
-    
-    # Sort by contribution score
-    contributions.sort(key=lambda x: abs(x.contribution_score), reverse=True)
+            feature_value = ", ".join(value_parts)
+        else:
+            feature_value = _PRESENT
+        
+        contributions.append(FeatureContribution(
+            feature_name=_DISPLAY_NAMES[name],
+            feature_value=feature_value,
+            contribution_score=round(min(score, 0.35), 2),
+            contribution_direction=Direction.INCREASES,
+            clinical_significance=clinical,
+            plain_language=plain
+        ))
+    
+    # Sort by contribution magnitude; abs() is taken once per item and the
+    # C-level itemgetter replaces a Python lambda as the sort key
+    if len(contributions) > 1:
+        decorated = [(abs(c.contribution_score), c) for c in contributions]
+        decorated.sort(key=itemgetter(0), reverse=True)
+        contributions = [c for _, c in decorated]
     
     return contributions
 
 
+# Column layout for batch scoring: Age, Sex, then each weighted symptom
+BATCH_SYMPTOMS: tuple[str, ...] = tuple(_SYMPTOM_WEIGHTS)
+BATCH_FEATURES: tuple[str, ...] = ("age", "sex") + BATCH_SYMPTOMS
+_BASE_SCORES = np.array([weights[0] for weights in _SYMPTOM_WEIGHTS.values()])
+
+
+def encode_symptom_batch(
+    symptom_lists: list[list[dict]]
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Encode per-patient symptom dicts into (n_patients, n_symptoms) arrays.
+    
+    Columns follow BATCH_SYMPTOMS; missing values are encoded as 0, which
+    the scoring rules treat the same as absent.
+    
+    Returns:
+        Tuple of (present, severity, duration_days, duration_minutes)
+    """
+    shape = (len(symptom_lists), len(BATCH_SYMPTOMS))
+    present = np.zeros(shape, dtype=bool)
+    severity = np.zeros(shape)
+    duration_days = np.zeros(shape)
+    duration_minutes = np.zeros(shape)
+    column = {name: j for j, name in enumerate(BATCH_SYMPTOMS)}
+    
+    for i, symptoms in enumerate(symptom_lists):
+        for symptom in symptoms:
+            j = column.get(symptom.get("name", ""))
+            if j is None:
+                continue
+            present[i, j] = bool(symptom.get("present", False))
+            severity[i, j] = symptom.get("severity") or 0
+            duration_days[i, j] = symptom.get("duration_days") or 0
+            duration_minutes[i, j] = symptom.get("duration_minutes") or 0
+    
+    return present, severity, duration_days, duration_minutes
+
+
+def _score_contributions_numpy(
+    base_scores: np.ndarray,
+    severities: np.ndarray,
+    dur_days: np.ndarray,
+    dur_mins: np.ndarray
+) -> np.ndarray:
+    """Apply severity/duration multipliers and the 0.35 cap with NumPy."""
+    scores = base_scores * np.where(severities >= 7, 1.3, 1.0)
+    scores *= np.where(dur_days > 30, 1.2, 1.0)
+    scores *= np.where(dur_mins > 30, 1.2, 1.0)
+    return np.minimum(scores, 0.35, out=scores)
+
+
+def _score_contributions_loop(base_scores, severities, dur_days, dur_mins):
+    """Apply severity/duration multipliers and the 0.35 cap (Numba source)."""
+    n_patients, n_symptoms = base_scores.shape
+    scores = np.empty((n_patients, n_symptoms))
+    for i in range(n_patients):
+        for j in range(n_symptoms):
+            score = base_scores[i, j]
+            if severities[i, j] >= 7:
+                score *= 1.3
+            if dur_days[i, j] > 30:
+                score *= 1.2
+            if dur_mins[i, j] > 30:
+                score *= 1.2
+            scores[i, j] = min(score, 0.35)
+    return scores
+
+
+# Batch scoring kernel, chosen on first use by _load_score_kernel
+_score_contributions = None
+
+
+def _load_score_kernel():
+    """
+    Pick the batch scoring kernel on first use.
+    
+    Numba is optional: when installed, the loop kernel is compiled to
+    native code (and cached on disk); otherwise NumPy does the work.
+    Importing numba costs a few hundred milliseconds, so it is deferred
+    until a batch is actually scored rather than paid at module import.
+    """
+    global _score_contributions
+    try:
+        from numba import njit
+    except ImportError:
+        _score_contributions = _score_contributions_numpy
+    else:
+        _score_contributions = njit(cache=True)(_score_contributions_loop)
+    return _score_contributions
+
+
+def calculate_feature_contributions_batch(
+    symptom_matrix: np.ndarray,
+    severity: np.ndarray,
+    duration_days: np.ndarray,
+    duration_minutes: np.ndarray,
+    ages: np.ndarray,
+    sex_female_mask: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorized contribution scores for many patients at once.
+    
+    Applies the same rules as calculate_feature_contributions, but over
+    (n_patients, n_symptoms) arrays laid out as in encode_symptom_batch.
+    Use it for audits and regression runs; build FeatureContribution
+    objects with the scalar function only for the patient being rendered.
+    
+    Returns:
+        (n_patients, len(BATCH_FEATURES)) array of contribution scores,
+        0 where a feature does not contribute
+    """
+    base_scores = _BASE_SCORES * np.asarray(symptom_matrix, dtype=bool)
+    kernel = _score_contributions or _load_score_kernel()
+    scores = kernel(
+        base_scores,
+        np.asarray(severity, dtype=np.float64),
+        np.asarray(duration_days, dtype=np.float64),
+        np.asarray(duration_minutes, dtype=np.float64),
+    )
+    
+    ages = np.asarray(ages)
+    age_scores = np.where(ages >= 50, 0.1, np.where(ages < 40, -0.05, 0.0))
+    sex_scores = np.where(sex_female_mask, 0.08, 0.0)
+    
+    # Round half up rather than np.round's half-to-even on the scaled value,
+    # which matches round() on scores like 0.25 * 1.3
+    combined = np.column_stack((age_scores, sex_scores, scores))
+    return np.floor(combined * 100 + 0.5) / 100
+
+
 def generate_counterfactuals(
     risk_level: str,
     feature_contributions: list[FeatureContribution]
@@ -264,16 +550,25 @@ def generate_counterfactuals(
     counterfactuals = []
     
     if risk_level == "HIGH":
-        top_factors = [c for c in feature_contributions if c.contribution_score > 0.15]
-        if top_factors:
+        # Contributions arrive sorted by |score| descending and the only
+        # negative score is tiny, so the first one at or below the threshold
+        # ends the run; only the two leading names are ever rendered
+        top_names = []
+        for c in feature_contributions:
+            if c.contribution_score <= 0.15:
+                break
+            top_names.append(c.feature_name.lower())
+            if len(top_names) == 2:
+                break
+        if top_names:
             counterfactuals.append(
-                f"The risk level would be MODERATE if {top_factors[0].feature_name.lower()} "
+                f"The risk level would be MODERATE if {top_names[0]} "
                 f"was not present or less severe."
             )
-        if len(top_factors) >= 2:
+        if len(top_names) == 2:
             counterfactuals.append(
-                f"If both {top_factors[0].feature_name.lower()} and "
-                f"{top_factors[1].feature_name.lower()} were absent, "
+                f"If both {top_names[0]} and "
+                f"{top_names[1]} were absent, "
                 f"the assessment would likely be LOW risk."
             )
     elif risk_level == "MODERATE":
@@ -291,6 +586,49 @@ def generate_counterfactuals(
     return counterfactuals
 
 
+# Row templates for the auditor report tables
+_AUDIT_ROW = "| {} | {} | {} | {} |\n"
+_FACTOR_ROW = "| {} | {} | {:+.2f} | {} |\n"
+
+# Static closing sections of the role explanations
+_CLINICIAN_EVIDENCE_FOOTER = (
+    "\n"
+    "### Evidence Base\n"
+    "- NICE NG100: Rheumatoid arthritis in adults\n"
+    "- NICE CG79: Early referral of suspected inflammatory arthritis\n"
+    "- BSR Guidelines for RMD management"
+)
+_PATIENT_REMEMBER_FOOTER = (
+    "### Remember:\n"
+    "- This check is a helpful first step, not a diagnosis\n"
+    "- Many joint conditions can be managed very well with proper care\n"
+    "- Early attention often leads to better outcomes\n"
+    "- Your GP and healthcare team are here to support you\n"
+    "\n"
+    "*If you have any questions, please discuss them with your GP or healthcare provider.*"
+)
+_AUDITOR_COMPLIANCE_FOOTER = (
+    "## Regulatory Compliance Notes\n"
+    "- This system is a **DEMONSTRATION PROTOTYPE** only\n"
+    "- Not certified for clinical use under MHRA/MDR regulations\n"
+    "- Audit trails maintained for transparency demonstration\n"
+    "- All explanations are deterministic and reproducible"
+)
+
+# Static system-information block of the auditor report
+_AUDITOR_SYSTEM_INFO = (
+    "## System Information\n"
+    "| Property | Value |\n"
+    "|----------|-------|\n"
+    "| System Version | RMD-Health-Demo v2.0.0 |\n"
+    f"| Model Version | {MODEL_VERSION} |\n"
+    "| Framework | LangChain + LangGraph |\n"
+    "| LLM Provider | Groq (Llama-3.1-8b) |\n"
+    "| Explanation Method | ReAct Traces + Rule-Based Attribution |\n"
+    "\n"
+)
+
+
 def create_clinician_explanation(
     risk_level: str,
     confidence: float,
@@ -303,55 +641,52 @@ def create_clinician_explanation(
     Generate a technical, evidence-based explanation for clinicians.
     Includes clinical terminology and references.
     """
-    lines = []
+    buf = io.StringIO()
+    w = buf.write
     
     # Header
-    lines.append(f"## Clinical Assessment Summary")
-    lines.append(f"**Risk Classification:** {risk_level}")
-    lines.append(f"**Model Confidence:** {confidence:.0%}")
-    lines.append("")
+    w("## Clinical Assessment Summary\n")
+    w(f"**Risk Classification:** {risk_level}\n")
+    w(f"**Model Confidence:** {confidence:.0%}\n")
+    w("\n")
     
     # Key clinical findings
-    lines.append("### Key Clinical Findings")
+    w("### Key Clinical Findings\n")
     for contrib in feature_contributions[:5]:
-        direction = "↑" if contrib.contribution_direction == "increases_risk" else "↓"
-        lines.append(f"- **{contrib.feature_name}** ({contrib.feature_value}): "
-                    f"{direction} {contrib.clinical_significance}")
-    lines.append("")
+        direction = "↑" if contrib.contribution_direction is Direction.INCREASES else "↓"
+        w(f"- **{contrib.feature_name}** ({contrib.feature_value}): "
+          f"{direction} {contrib.clinical_significance}\n")
+    w("\n")
     
     # Differential considerations
     if likely_conditions:
-        lines.append("### Differential Considerations")
+        w("### Differential Considerations\n")
         for i, condition in enumerate(likely_conditions, 1):
-            lines.append(f"{i}. {condition}")
-        lines.append("")
+            w(f"{i}. {condition}\n")
+        w("\n")
     
     # Red flags
     if red_flags:
-        lines.append("### ⚠️ Red Flags Identified")
+        w("### ⚠️ Red Flags Identified\n")
         for flag in red_flags:
-            lines.append(f"- {flag}")
-        lines.append("")
+            w(f"- {flag}\n")
+        w("\n")
     
     # Agent reasoning trace (collapsed by default)
     if reasoning_steps:
-        lines.append("### Agent Reasoning Trace")
-        lines.append("The AI agent followed this clinical logic:")
+        w("### Agent Reasoning Trace\n")
+        w("The AI agent followed this clinical logic:\n")
         for step in reasoning_steps:
-            lines.append(f"**Step {step.step_number}:** {step.thought}")
+            w(f"**Step {step.step_number}:** {step.thought}\n")
             if step.tool_used:
-                lines.append(f"  - Tool: `{step.tool_used}`")
+                w(f"  - Tool: `{step.tool_used}`\n")
             if step.observation:
-                lines.append(f"  - Finding: {step.observation[:200]}...")
+                w(f"  - Finding: {step.observation[:200]}...\n")
     
     # Evidence base
-    lines.append("")
-    lines.append("### Evidence Base")
-    lines.append("- NICE NG100: Rheumatoid arthritis in adults")
-    lines.append("- NICE CG79: Early referral of suspected inflammatory arthritis")
-    lines.append("- BSR Guidelines for RMD management")
+    w(_CLINICIAN_EVIDENCE_FOOTER)
     
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
 def create_patient_explanation(
@@ -363,58 +698,63 @@ def create_patient_explanation(
     Generate a simple, reassuring explanation for patients.
     Uses plain language, avoids medical jargon.
     """
-    lines = []
+    buf = io.StringIO()
+    w = buf.write
     
     # Warm header
-    lines.append("## Your Joint Health Check Results")
-    lines.append("")
+    w("## Your Joint Health Check Results\n")
+    w("\n")
     
     # Result in plain language
     if risk_level == "HIGH":
-        lines.append("### 🔴 We'd like a specialist to see you soon")
-        lines.append("")
-        lines.append("Based on your symptoms, we think it would be helpful for you to see a "
-                    "joint specialist (called a rheumatologist). This doesn't mean anything "
-                    "is definitely wrong – it just means we want to make sure you get the "
-                    "right care.")
+        w("### 🔴 We'd like a specialist to see you soon\n")
+        w("\n")
+        w("Based on your symptoms, we think it would be helpful for you to see a "
+          "joint specialist (called a rheumatologist). This doesn't mean anything "
+          "is definitely wrong – it just means we want to make sure you get the "
+          "right care.\n")
     elif risk_level == "MODERATE":
-        lines.append("### 🟡 We'd like to learn more")
-        lines.append("")
-        lines.append("Your symptoms suggest we should look into this further. Your GP can "
-                    "help arrange some tests or a follow-up appointment to better understand "
-                    "what's happening.")
+        w("### 🟡 We'd like to learn more\n")
+        w("\n")
+        w("Your symptoms suggest we should look into this further. Your GP can "
+          "help arrange some tests or a follow-up appointment to better understand "
+          "what's happening.\n")
     else:
-        lines.append("### 🟢 Things look okay for now")
-        lines.append("")
-        lines.append("Based on what you've told us, your symptoms don't suggest anything "
-                    "serious right now. However, if things change or get worse, please don't "
-                    "hesitate to speak to your GP.")
+        w("### 🟢 Things look okay for now\n")
+        w("\n")
+        w("Based on what you've told us, your symptoms don't suggest anything "
+          "serious right now. However, if things change or get worse, please don't "
+          "hesitate to speak to your GP.\n")
     
-    lines.append("")
+    w("\n")
     
     # What we looked at
-    lines.append("### What we looked at:")
+    w("### What we looked at:\n")
     for contrib in feature_contributions[:4]:
-        lines.append(f"- {contrib.plain_language}")
+        w(f"- {contrib.plain_language}\n")
     
-    lines.append("")
+    w("\n")
     
     # Next steps
-    lines.append("### What happens next?")
-    lines.append(f"**{recommended_action}**")
-    lines.append("")
+    w("### What happens next?\n")
+    w(f"**{recommended_action}**\n")
+    w("\n")
     
     # Reassurance
-    lines.append("### Remember:")
-    lines.append("- This check is a helpful first step, not a diagnosis")
-    lines.append("- Many joint conditions can be managed very well with proper care")
-    lines.append("- Early attention often leads to better outcomes")
-    lines.append("- Your GP and healthcare team are here to support you")
-    
-    lines.append("")
-    lines.append("*If you have any questions, please discuss them with your GP or healthcare provider.*")
+    w(_PATIENT_REMEMBER_FOOTER)
     
-    return "\n".join(lines)
+    return buf.getvalue()
+
+
+def _format_time(t: datetime) -> str:
+    """Format a timestamp as HH:MM:SS.mmm without a strftime round trip."""
+    return f"{t.hour:02d}:{t.minute:02d}:{t.second:02d}.{t.microsecond // 1000:03d}"
+
+
+def _short_details(details: dict) -> str:
+    """Stringify audit entry details, truncated to 50 characters for tables."""
+    text = str(details)
+    return text[:50] + "..." if len(text) > 50 else text
 
 
 def create_auditor_explanation(
@@ -422,77 +762,96 @@ def create_auditor_explanation(
     audit_trail: list[AuditEntry],
     feature_contributions: list[FeatureContribution],
     reasoning_steps: list[ReasoningStep],
-    input_hash: str
+    input_hash: str,
+    generated_at: Optional[datetime] = None
 ) -> str:
     """
     Generate a complete audit log for regulators/auditors.
     Includes timestamps, hashes, and decision audit trail.
+    
+    Pass the explanation's generated_at so the header matches the audit
+    trail timestamps; defaults to the current time.
     """
-    lines = []
+    if generated_at is None:
+        generated_at = datetime.now()
+    
+    buf = io.StringIO()
+    w = buf.write
     
     # Header
-    lines.append("# AUDIT LOG")
-    lines.append(f"**Assessment ID:** {assessment_id}")
-    lines.append(f"**Generated:** {datetime.now().isoformat()}")
-    lines.append(f"**Input Data Hash:** SHA256:{input_hash}")
-    lines.append("")
+    w("# AUDIT LOG\n")
+    w(f"**Assessment ID:** {assessment_id}\n")
+    w(f"**Generated:** {generated_at.isoformat()}\n")
+    w(f"**Input Data Hash:** {INPUT_HASH_ALGORITHM}:{input_hash}\n")
+    w("\n")
     
     # System information
-    lines.append("## System Information")
-    lines.append("| Property | Value |")
-    lines.append("|----------|-------|")
-    lines.append("| System Version | RMD-Health-Demo v2.0.0 |")
-    lines.append("| Model Version | rmd-agent-v2.0.0 |")
-    lines.append("| Framework | LangChain + LangGraph |")
-    lines.append("| LLM Provider | Groq (Llama-3.1-8b) |")
-    lines.append("| Explanation Method | ReAct Traces + Rule-Based Attribution |")
-    lines.append("")
+    w(_AUDITOR_SYSTEM_INFO)
     
     # Processing steps
-    lines.append("## Processing Steps")
-    lines.append("| Step | Timestamp | Event | Details |")
-    lines.append("|------|-----------|-------|---------|")
-    
-    for entry in audit_trail:
-        details_short = str(entry.details)[:50] + "..." if len(str(entry.details)) > 50 else str(entry.details)
-        lines.append(f"| {entry.entry_id[:8]} | {entry.timestamp.strftime('%H:%M:%S.%f')[:-3]} | "
-                    f"{entry.event_type} | {details_short} |")
+    w("## Processing Steps\n")
+    w("| Step | Timestamp | Event | Details |\n")
+    w("|------|-----------|-------|---------|\n")
+    
+    buf.writelines(
+        _AUDIT_ROW.format(
+            entry.entry_id[:8], _format_time(entry.timestamp),
+            entry.event_type, _short_details(entry.details)
+        )
+        for entry in audit_trail
+    )
     
-    lines.append("")
+    w("\n")
     
     # Decision factors
-    lines.append("## Decision Factors")
-    lines.append("| Factor | Value | Contribution | Direction |")
-    lines.append("|--------|-------|--------------|-----------|")
-    
-    for contrib in feature_contributions:
-        lines.append(f"| {contrib.feature_name} | {contrib.feature_value} | "
-                    f"{contrib.contribution_score:+.2f} | {contrib.contribution_direction} |")
+    w("## Decision Factors\n")
+    w("| Factor | Value | Contribution | Direction |\n")
+    w("|--------|-------|--------------|-----------|\n")
+    
+    buf.writelines(
+        _FACTOR_ROW.format(
+            contrib.feature_name, contrib.feature_value,
+            contrib.contribution_score, contrib.contribution_direction.label
+        )
+        for contrib in feature_contributions
+    )
     
-    lines.append("")
+    w("\n")
     
     # Reasoning trace
-    lines.append("## Agent Reasoning Trace")
+    w("## Agent Reasoning Trace\n")
     for step in reasoning_steps:
-        lines.append(f"### Step {step.step_number} ({step.timestamp.strftime('%H:%M:%S.%f')[:-3]})")
-        lines.append(f"- **Thought:** {step.thought}")
+        w(f"### Step {step.step_number} ({_format_time(step.timestamp)})\n")
+        w(f"- **Thought:** {step.thought}\n")
         if step.action:
-            lines.append(f"- **Action:** {step.action}")
+            w(f"- **Action:** {step.action}\n")
         if step.tool_used:
-            lines.append(f"- **Tool Used:** {step.tool_used}")
+            w(f"- **Tool Used:** {step.tool_used}\n")
         if step.observation:
-            lines.append(f"- **Observation:** {step.observation}")
-        lines.append(f"- **Duration:** {step.duration_ms}ms")
-        lines.append("")
+            w(f"- **Observation:** {step.observation}\n")
+        w(f"- **Duration:** {step.duration_ms}ms\n")
+        w("\n")
     
     # Compliance notes
-    lines.append("## Regulatory Compliance Notes")
-    lines.append("- This system is a **DEMONSTRATION PROTOTYPE** only")
-    lines.append("- Not certified for clinical use under MHRA/MDR regulations")
-    lines.append("- Audit trails maintained for transparency demonstration")
-    lines.append("- All explanations are deterministic and reproducible")
+    w(_AUDITOR_COMPLIANCE_FOOTER)
     
-    return "\n".join(lines)
+    return buf.getvalue()
+
+
+# Simulated timing for the demo reasoning trace and audit trail; the
+# audit table pairs each event with its entry ID and offset from the start
+_REASONING_STEP = timedelta(milliseconds=150)
+_AUDIT_EVENTS = tuple(
+    (f"AE-{i:04d}", event, timedelta(milliseconds=i * 100))
+    for i, event in enumerate([
+        "INPUT_RECEIVED",
+        "INPUT_VALIDATED",
+        "AGENT_STARTED",
+        "TOOLS_EXECUTED",
+        "ASSESSMENT_GENERATED",
+        "EXPLANATION_CREATED"
+    ], 1)
+)
 
 
 def generate_xai_explanation(
@@ -503,14 +862,22 @@ def generate_xai_explanation(
     likely_conditions: list[str],
     recommended_action: str,
     red_flags: list[str],
-    tools_used: list[str]
+    tools_used: list[str],
+    generated_at: Optional[datetime] = None,
+    eager: bool = False
 ) -> XAIExplanation:
     """
     Generate a complete XAI explanation package with views for all user types.
     
     This is the main function to call after generating an assessment.
+    The clock is read once (or generated_at is used if given) and shared
+    by the reasoning trace, audit trail and auditor report.
+    
+    Role explanations render on first access; pass eager=True to render
+    all three up front (e.g. for archival).
     """
-    generated_at = datetime.now()
+    if generated_at is None:
+        generated_at = datetime.now()
     
     # Calculate feature contributions
     symptoms = patient_data.get("symptoms", [])
@@ -526,9 +893,8 @@ def generate_xai_explanation(
     reasoning_steps = []
     step_time = generated_at
     
-    for i, tool in enumerate(tools_used or ["analyze_symptoms", "calculate_risk"], 1):
-        from datetime import timedelta
-        step_time = step_time + timedelta(milliseconds=150)
+    for i, tool in enumerate(tools_used or ("analyze_symptoms", "calculate_risk"), 1):
+        step_time = step_time + _REASONING_STEP
         reasoning_steps.append(ReasoningStep(
             step_number=i,
             timestamp=step_time,
@@ -543,35 +909,31 @@ def generate_xai_explanation(
     input_hash = generate_input_hash(patient_data)
     audit_trail = [
         AuditEntry(
-            entry_id=f"AE-{i:04d}",
-            timestamp=generated_at + timedelta(milliseconds=i*100),
+            entry_id=entry_id,
+            timestamp=generated_at + offset,
             event_type=event,
             details={"status": "completed"}
         )
-        for i, event in enumerate([
-            "INPUT_RECEIVED",
-            "INPUT_VALIDATED",
-            "AGENT_STARTED",
-            "TOOLS_EXECUTED",
-            "ASSESSMENT_GENERATED",
-            "EXPLANATION_CREATED"
-        ], 1)
+        for entry_id, event, offset in _AUDIT_EVENTS
     ]
     
-    # Generate role-specific explanations
-    clinician_summary = create_clinician_explanation(
-        risk_level, confidence, feature_contributions,
-        likely_conditions, reasoning_steps, red_flags
-    )
-    
-    patient_summary = create_patient_explanation(
-        risk_level, feature_contributions, recommended_action
-    )
-    
-    auditor_summary = create_auditor_explanation(
-        assessment_id, audit_trail, feature_contributions,
-        reasoning_steps, input_hash
-    )
+    # Role-specific explanations are rendered only when first requested
+    renderers = {
+        UserRole.CLINICIAN: partial(
+            create_clinician_explanation,
+            risk_level, confidence, feature_contributions,
+            likely_conditions, reasoning_steps, red_flags
+        ),
+        UserRole.PATIENT: partial(
+            create_patient_explanation,
+            risk_level, feature_contributions, recommended_action
+        ),
+        UserRole.AUDITOR: partial(
+            create_auditor_explanation,
+            assessment_id, audit_trail, feature_contributions,
+            reasoning_steps, input_hash, generated_at
+        ),
+    }
     
     # Extract key factors
     key_factors = [
@@ -579,7 +941,7 @@ def generate_xai_explanation(
         for c in feature_contributions[:5]
     ]
     
-    return XAIExplanation(
+    explanation = XAIExplanation(
         assessment_id=assessment_id,
         risk_level=risk_level,
         confidence_score=confidence,
@@ -587,13 +949,15 @@ def generate_xai_explanation(
         feature_contributions=feature_contributions,
         reasoning_steps=reasoning_steps,
         audit_trail=audit_trail,
-        clinician_summary=clinician_summary,
-        patient_summary=patient_summary,
-        auditor_summary=auditor_summary,
         counterfactuals=counterfactuals,
         key_factors=key_factors,
-        red_flags=red_flags
+        red_flags=list(red_flags),
+        renderers=renderers
     )
+    if eager:
+        for role in UserRole:
+            explanation.summary(role)
+    return explanation
 
 
 def get_explanation_for_role(
@@ -603,11 +967,7 @@ def get_explanation_for_role(
     """
     Get the appropriate explanation view for a specific user role.
     """
-    if role == UserRole.CLINICIAN:
-        return explanation.clinician_summary
-    elif role == UserRole.PATIENT:
-        return explanation.patient_summary
-    elif role == UserRole.AUDITOR:
-        return explanation.auditor_summary
+    if role in (UserRole.CLINICIAN, UserRole.PATIENT, UserRole.AUDITOR):
+        return explanation.summary(role)
     else:
         return explanation.clinician_summary
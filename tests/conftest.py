@@ -0,0 +1,78 @@
+"""
+Shared fixtures for the RMD-Health test suite.
+
+The screening pipeline (patient -> assessment -> XAI -> FHIR bundle) is
+built once per session, or once per worker under ``pytest -n auto``, and
+the tests read from it.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from src.data_models import PatientScreening
+from src.fhir_resources import create_screening_bundle
+from src.rmd_agent import demo_assessment
+from src.xai_explanations import generate_xai_explanation
+
+
+# The same patient test_demo.py screens
+PATIENT_JSON = (Path(__file__).resolve().parent.parent / 'sample_data' / 'test_patient.json').read_text()
+TOOLS_USED = ['analyze_inflammatory_markers', 'analyze_joint_pattern', 'calculate_risk_score']
+
+
+@pytest.fixture(scope='session')
+def patient():
+    return PatientScreening.model_validate_json(PATIENT_JSON)
+
+
+@pytest.fixture(scope='session')
+def assessment(patient):
+    return demo_assessment(patient)
+
+
+@pytest.fixture(scope='session')
+def patient_data(patient):
+    return patient.model_dump(include={'age', 'sex', 'symptoms'})
+
+
+@pytest.fixture(scope='session')
+def assessment_data(assessment):
+    return {
+        'risk_level': assessment.risk_level,
+        'likely_conditions': assessment.likely_conditions,
+        'reasoning': assessment.reasoning[:100],
+        'recommended_next_step': assessment.recommended_next_step,
+        'confidence_score': assessment.confidence_score,
+        'red_flags_identified': assessment.red_flags_identified
+    }
+
+
+@pytest.fixture(scope='session')
+def tools_used():
+    return list(TOOLS_USED)
+
+
+@pytest.fixture(scope='session')
+def xai(assessment, patient_data, tools_used):
+    return generate_xai_explanation(
+        assessment_id='TEST-001',
+        patient_data=patient_data,
+        risk_level=assessment.risk_level,
+        confidence=assessment.confidence_score,
+        likely_conditions=assessment.likely_conditions,
+        recommended_action=assessment.recommended_next_step,
+        red_flags=assessment.red_flags_identified,
+        tools_used=tools_used
+    )
+
+
+@pytest.fixture(scope='session')
+def bundle(patient, patient_data, assessment_data):
+    return create_screening_bundle(
+        patient_id=patient.patient_id,
+        age=patient.age,
+        sex=patient.sex,
+        symptoms=patient_data['symptoms'],
+        assessment=assessment_data
+    )
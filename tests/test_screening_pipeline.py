@@ -0,0 +1,200 @@
+"""
+Pytest version of the checks in test_demo.py.
+
+Run with ``pytest`` (or ``pytest -n auto`` with pytest-xdist installed).
+"""
+
+import importlib
+import json
+import random
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.data_models import Symptom
+from src.fhir_resources import stream_screening_bundle
+from src.rmd_agent import RMDScreeningAgent
+from src.utils import check_rmd_patterns
+import src.xai_explanations as xai_explanations
+from src.xai_explanations import Direction, UserRole, generate_input_hash
+
+
+@pytest.mark.parametrize('module_name, names', [
+    ('src.xai_explanations', (
+        'UserRole', 'XAIExplanation', 'generate_xai_explanation',
+        'FeatureContribution', 'ReasoningStep', 'AuditEntry', 'Direction'
+    )),
+    ('src.rmd_agent', ('RMDScreeningAgent', 'demo_assessment')),
+    ('src.data_models', ('PatientScreening', 'Symptom', 'RMDAssessment')),
+    ('src.fhir_resources', ('create_screening_bundle', 'stream_screening_bundle', 'FHIRBundle')),
+])
+def test_public_api(module_name, names):
+    module = importlib.import_module(module_name)
+    assert [name for name in names if not hasattr(module, name)] == []
+
+
+def test_patient_creation(patient):
+    assert patient.patient_id
+    assert (patient.age, patient.sex) == (52, 'Female')
+    assert len(patient.symptoms) == 6
+    assert patient.has_symptom('morning_stiffness')
+
+
+def test_demo_assessment(assessment):
+    assert assessment.risk_level == 'HIGH'
+    assert assessment.confidence_score == 0.95
+    assert assessment.likely_conditions[0] == 'Rheumatoid Arthritis'
+    assert assessment.red_flags_identified == [
+        'Multiple joint involvement', 'Prolonged morning stiffness', 'Joint swelling with redness'
+    ]
+
+
+def test_xai_explanation(xai, tools_used):
+    assert xai.risk_level == 'HIGH'
+    assert xai.counts == (8, 3, 6, 2)
+    assert xai.counts == (
+        len(xai.feature_contributions),
+        len(xai.reasoning_steps),
+        len(xai.audit_trail),
+        len(xai.counterfactuals),
+    )
+    assert [step.tool_used for step in xai.reasoning_steps] == tools_used
+    assert [entry.entry_id for entry in xai.audit_trail] == [f'AE-{i:04d}' for i in range(1, 7)]
+    assert xai.feature_contributions[0].feature_name == 'Multiple Joints Affected'
+
+
+@pytest.mark.parametrize('role, expected', [
+    (UserRole.CLINICIAN, ['## Clinical Assessment Summary', '**Risk Classification:** HIGH', '**Model Confidence:** 95%']),
+    (UserRole.PATIENT, ['## Your Joint Health Check Results', 'rheumatologist']),
+    (UserRole.AUDITOR, ['# AUDIT LOG', '**Assessment ID:** TEST-001', '| Model Version | rmd-agent-v2.0.0 |']),
+])
+def test_role_explanation(xai, role, expected):
+    text = xai.summary(role)
+    assert [line for line in expected if line not in text] == []
+
+
+def test_auditor_header(xai, patient_data):
+    header = xai.auditor_summary.splitlines()[:4]
+    assert header == [
+        '# AUDIT LOG',
+        '**Assessment ID:** TEST-001',
+        f'**Generated:** {xai.generated_at.isoformat()}',
+        f'**Input Data Hash:** {xai_explanations.INPUT_HASH_ALGORITHM}:{generate_input_hash(patient_data)}',
+    ]
+
+
+def test_fhir_bundle(bundle, patient):
+    resource_types = [resource_type for resource_type, _ in bundle.iter_resources()]
+    assert bundle.type == 'collection'
+    assert resource_types == ['Patient'] + ['Observation'] * len(patient.symptoms) + ['RiskAssessment']
+    assert json.loads(bundle.to_fhir_bytes()) == bundle.to_fhir_json()
+
+
+def test_streamed_fhir_bundle(patient, patient_data, assessment_data):
+    buf = bytearray()
+    streamed = stream_screening_bundle(
+        buf.extend,
+        patient_id=patient.patient_id,
+        age=patient.age,
+        sex=patient.sex,
+        symptoms=patient_data['symptoms'],
+        assessment=assessment_data
+    )
+    document = json.loads(buf)
+    assert streamed == len(document['entry']) == len(patient.symptoms) + 2
+    assert document['resourceType'] == 'Bundle'
+
+
+def test_agent_configuration(monkeypatch):
+    monkeypatch.delenv('GROQ_API_KEY', raising=False)
+    assert RMDScreeningAgent.MODEL_NAME
+    assert len(RMDScreeningAgent.TOOLS) == 5
+    assert not RMDScreeningAgent.has_env_key()
+    agent = RMDScreeningAgent()
+    assert not agent.is_configured()
+    assert agent.model_name == RMDScreeningAgent.MODEL_NAME
+    assert agent.tools == list(RMDScreeningAgent.TOOLS)
+    # An explicit key configures the instance even with GROQ_API_KEY unset
+    monkeypatch.setattr(RMDScreeningAgent, '_setup_agent', lambda self: None)
+    assert RMDScreeningAgent(api_key='gsk_' + 'x' * 20).is_configured()
+    monkeypatch.setenv('GROQ_API_KEY', 'gsk_' + 'x' * 20)
+    assert RMDScreeningAgent.has_env_key()
+
+
+def test_feature_contributions(xai):
+    scores = [abs(c.contribution_score) for c in xai.feature_contributions]
+    assert scores == sorted(scores, reverse=True)
+    assert all(
+        c.contribution_direction is (Direction.INCREASES if c.contribution_score > 0 else Direction.DECREASES)
+        for c in xai.feature_contributions
+    )
+
+
+def test_symptom_lookup_sees_replaced_symptoms(patient):
+    updated = patient.model_copy(deep=True)
+    assert 'POLYARTICULAR' in check_rmd_patterns(updated)
+    index = next(i for i, s in enumerate(updated.symptoms) if s.name == 'multiple_joints_affected')
+    updated.symptoms[index] = Symptom(name='multiple_joints_affected', present=False)
+    assert 'POLYARTICULAR' not in check_rmd_patterns(updated)
+
+
+@pytest.mark.skipif(xai_explanations.orjson is None, reason='orjson not installed')
+def test_input_hash_matches_without_orjson(monkeypatch, patient_data):
+    payloads = [
+        patient_data,
+        {'screened_at': datetime(2026, 1, 1, 9, 30), 'notes': 'café', 'score': 0.25},
+        {'age': 52, 'large': 2 ** 70},
+        {'contribution': xai_explanations.FeatureContribution('Age', '52 years', 0.1, Direction.INCREASES, '', '')},
+        {1: 'int key', 2: 'sorted numerically'},
+    ]
+    with_orjson = [generate_input_hash(payload) for payload in payloads]
+    monkeypatch.setattr(xai_explanations, 'orjson', None)
+    assert [generate_input_hash(payload) for payload in payloads] == with_orjson
+
+
+def _random_patients(n, seed=1234):
+    rng = random.Random(seed)
+    patients = []
+    for _ in range(n):
+        symptoms = [
+            {
+                'name': name,
+                'present': rng.random() < 0.6,
+                'severity': rng.choice([None, *range(1, 11)]),
+                'duration_days': rng.choice([None, 0, 7, 30, 31, 90]),
+                'duration_minutes': rng.choice([None, 0, 15, 30, 31, 120]),
+            }
+            for name in xai_explanations.BATCH_SYMPTOMS
+            if rng.random() < 0.8
+        ]
+        patients.append((symptoms, rng.randint(18, 90), rng.choice(['Female', 'Male'])))
+    return patients
+
+
+@pytest.mark.parametrize('kernel', ['default', 'numpy'])
+def test_batch_contributions_match_scalar(monkeypatch, kernel):
+    if kernel == 'numpy':
+        monkeypatch.setattr(
+            xai_explanations, '_score_contributions', xai_explanations._score_contributions_numpy
+        )
+    patients = _random_patients(500)
+    symptom_lists, ages, sexes = zip(*patients)
+    batch = xai_explanations.calculate_feature_contributions_batch(
+        *xai_explanations.encode_symptom_batch(list(symptom_lists)),
+        np.array(ages),
+        np.array([sex == 'Female' for sex in sexes])
+    )
+    columns = ['Age', 'Sex'] + [
+        xai_explanations._DISPLAY_NAMES[name] for name in xai_explanations.BATCH_SYMPTOMS
+    ]
+    for row, (symptoms, age, sex) in zip(batch, patients):
+        expected = dict.fromkeys(columns, 0.0)
+        for c in xai_explanations.calculate_feature_contributions(symptoms, age, sex):
+            expected[c.feature_name] = c.contribution_score
+        assert row.tolist() == pytest.approx([expected[name] for name in columns])
+
+
+def test_xai_to_dict_stores_direction_labels(xai):
+    archived = json.loads(json.dumps(xai.to_dict(), default=str))
+    assert {fc['contribution_direction'] for fc in archived['feature_contributions']} == {'increases_risk'}